@@ -1,13 +1,14 @@
 #  Copyright 2024 Amazon.com, Inc. or its affiliates.
 
 # flake8: noqa
+from .session import make_session, shared_session
 from .test_create_viewpoint import create_viewpoint, create_viewpoint_invalid
 from .test_delete_viewpoint import delete_viewpoint, delete_viewpoint_invalid
 from .test_describe_viewpoint import describe_viewpoint, describe_viewpoint_invalid
 from .test_get_bounds import get_bounds, get_bounds_invalid
 from .test_get_crop import get_crop, get_crop_invalid
 from .test_get_info import get_info, get_info_invalid
-from .test_get_map_tile import get_map_tile, get_map_tileset_metadata, get_map_tilesets
+from .test_get_map_tile import get_map_tile, get_map_tiles, get_map_tileset_metadata, get_map_tilesets
 from .test_get_metadata import get_metadata, get_metadata_invalid
 from .test_get_preview import get_preview, get_preview_invalid
 from .test_get_statistics import get_statistics, get_statistics_invalid
@@ -0,0 +1,98 @@
+#  Copyright 2024 Amazon.com, Inc. or its affiliates.
+
+from functools import lru_cache
+from typing import Set
+from urllib.parse import urlsplit
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 50
+
+# Content types the endpoint tests expect, matched as prefixes since a charset may follow
+PNG = "image/png"
+JPEG = "image/jpeg"
+JSON = "application/json"
+
+# Detail of the 404 for a deleted viewpoint, which the preview and crop routes both report under PREVIEW
+DELETED_PREVIEW = b"Cannot view ViewpointApiNames.PREVIEW for this image since this has already been deleted."
+
+# Largest body read off a header-only GET so its connection goes back to the pool instead of being dropped
+_DRAIN_LIMIT_BYTES = 1024 * 1024
+
+# Hosts that rejected a HEAD request, so later header-only checks go straight to a streamed GET
+_HEAD_UNSUPPORTED_HOSTS: Set[str] = set()
+
+
+def make_session(pool_size: int = DEFAULT_POOL_SIZE) -> Session:
+    """
+    Create a requests session with a connection pool large enough for the endpoint tests to share.
+
+    :param pool_size: Number of connections to keep alive per host.
+
+    return Session: Session with the pooled adapter mounted for http and https
+    """
+    session = Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # Only reads are retried; a retried PUT or DELETE the server already applied would fail or update twice
+        max_retries=Retry(
+            total=3, backoff_factor=0.1, status_forcelist=(502, 503, 504), allowed_methods=frozenset({"GET", "HEAD"})
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def shared_session() -> Session:
+    """
+    Get the pooled session shared by every test run in this process, so kept-alive connections to the Tile Server
+    are reused instead of repeating the TCP and TLS handshakes for each run.
+
+    return Session: Process-wide session built by make_session
+    """
+    return make_session()
+
+
+def fetch_headers(session: Session, url: str) -> Response:
+    """
+    Fetch the status and headers of a resource without downloading its body. A HEAD request is used when the
+    server implements it, otherwise a streamed GET is used and its body is only read when it is small enough that
+    keeping the connection alive is cheaper than opening a new one.
+
+    :param session: Requests session to use to send the request.
+    :param url: URL to send the request to.
+
+    return Response: Closed response carrying the status code and headers
+    """
+    host = urlsplit(url).netloc
+    if host not in _HEAD_UNSUPPORTED_HOSTS:
+        res = session.head(url, allow_redirects=True)
+        if res.status_code not in (405, 501):
+            return res
+        _HEAD_UNSUPPORTED_HOSTS.add(host)
+    with session.get(url, stream=True) as res:
+        content_length = res.headers.get("Content-Length")
+        if content_length is None or int(content_length) <= _DRAIN_LIMIT_BYTES:
+            # Drains the body; closing an unread response discards the socket instead of returning it to the pool
+            res.content
+        return res
+
+
+def failure_message(res: Response, include_body: bool = True) -> str:
+    """
+    Describe an unexpected response for an assertion message.
+
+    :param res: Response that failed the status check.
+    :param include_body: Append the start of the body; leave False for HEAD and streamed responses.
+
+    return str: Request method, URL, status, and optionally the first 200 characters of the body
+    """
+    message = f"{res.request.method} {res.url} -> {res.status_code} {res.reason}"
+    if include_body:
+        message = f"{message}: {res.text[:200]}"
+    return message
@@ -4,6 +4,8 @@ from typing import Any, Dict
 
 from requests import Session
 
+from .session import failure_message
+
 
 def create_viewpoint(session: Session, url: str, test_body_data: Dict[str, Any]) -> str:
     """
@@ -16,9 +18,8 @@ def create_viewpoint(session: Session, url: str, test_body_data: Dict[str, Any])
     return str: Viewpoint_id or the created viewpoint
     """
     res = session.post(url, json=test_body_data)
-    res.raise_for_status()
+    assert res.status_code == 201, failure_message(res)
 
-    assert res.status_code == 201
     response_data = res.json()
     assert response_data.get("viewpoint_id") is not None
     assert response_data.get("viewpoint_status") == "REQUESTED"
@@ -34,8 +35,8 @@ def create_viewpoint_invalid(session: Session, url: str, test_body_data: Dict[st
     return: None
     """
     res = session.post(url, json=test_body_data)
+    assert res.status_code == 422, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 422
     assert response_data["detail"][0]["msg"] == "Input should be a valid string"
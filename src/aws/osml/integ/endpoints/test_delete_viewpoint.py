@@ -2,6 +2,10 @@
 
 from requests import Session
 
+from .session import failure_message
+
+_DELETED_UPDATE = b"Cannot view ViewpointApiNames.UPDATE for this image since this has already been deleted"
+
 
 def delete_viewpoint(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -14,11 +18,10 @@ def delete_viewpoint(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.delete(f"{url}/{viewpoint_id}")
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 200
     assert response_data["viewpoint_status"] == "DELETED"
     assert response_data["local_object_path"] is None
     assert response_data["expire_time"] is not None
@@ -35,10 +38,6 @@ def delete_viewpoint_invalid(session: Session, url: str, viewpoint_id: str) -> N
     return: None
     """
     res = session.delete(f"{url}/{viewpoint_id}")
+    assert res.status_code == 404, failure_message(res)
 
-    response_data = res.json()
-
-    assert res.status_code == 404
-    assert (
-        "Cannot view ViewpointApiNames.UPDATE for this image since this has already been deleted" in response_data["detail"]
-    )
+    assert _DELETED_UPDATE in res.content
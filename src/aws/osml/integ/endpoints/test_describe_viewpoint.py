@@ -2,6 +2,10 @@
 
 from requests import Session
 
+from .session import failure_message
+
+_INVALID_KEY = b"Invalid Key, it does not exist in ViewpointStatusTable"
+
 
 def describe_viewpoint(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -14,11 +18,10 @@ def describe_viewpoint(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}")
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 200
     assert response_data["viewpoint_id"] == viewpoint_id
     assert response_data["viewpoint_status"] != "DELETED"
 
@@ -34,8 +37,6 @@ def describe_viewpoint_invalid(session: Session, url: str, viewpoint_id: str) ->
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}")
+    assert res.status_code == 500, failure_message(res)
 
-    response_data = res.json()
-
-    assert res.status_code == 500
-    assert "Invalid Key, it does not exist in ViewpointStatusTable" in response_data["detail"]
+    assert _INVALID_KEY in res.content
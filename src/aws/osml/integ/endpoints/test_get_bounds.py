@@ -2,6 +2,10 @@
 
 from requests import Session
 
+from .session import failure_message
+
+_DELETED_BOUNDS = b"Cannot view ViewpointApiNames.BOUNDS for this image since this has already been deleted."
+
 
 def get_bounds(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -14,11 +18,10 @@ def get_bounds(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/bounds")
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 200
     assert response_data["bounds"] is not None
 
 
@@ -33,10 +36,6 @@ def get_bounds_invalid(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/bounds")
+    assert res.status_code == 404, failure_message(res)
 
-    response_data = res.json()
-
-    assert res.status_code == 404
-    assert (
-        "Cannot view ViewpointApiNames.BOUNDS for this image since this has already been deleted." in response_data["detail"]
-    )
+    assert _DELETED_BOUNDS in res.content
@@ -1,7 +1,13 @@
 #  Copyright 2024 Amazon.com, Inc. or its affiliates.
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
 from requests import Session
 
+from .session import JSON, PNG, failure_message, fetch_headers
+
 
 def get_map_tilesets(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -13,11 +19,10 @@ def get_map_tilesets(session: Session, url: str, viewpoint_id: str) -> None:
 
     return: None
     """
-    res = session.get(f"{url}/{viewpoint_id}/map/tiles")
-    res.raise_for_status()
+    res = fetch_headers(session, f"{url}/{viewpoint_id}/map/tiles")
+    assert res.status_code == 200, failure_message(res, include_body=False)
 
-    assert res.status_code == 200
-    assert res.headers.get("content-type") == "application/json"
+    assert res.headers.get("content-type", "").startswith(JSON)
 
 
 def get_map_tileset_metadata(session: Session, url: str, viewpoint_id: str, tileset_id: str) -> None:
@@ -31,11 +36,10 @@ def get_map_tileset_metadata(session: Session, url: str, viewpoint_id: str, tile
 
     return: None
     """
-    res = session.get(f"{url}/{viewpoint_id}/map/tiles/{tileset_id}")
-    res.raise_for_status()
+    res = fetch_headers(session, f"{url}/{viewpoint_id}/map/tiles/{tileset_id}")
+    assert res.status_code == 200, failure_message(res, include_body=False)
 
-    assert res.status_code == 200
-    assert res.headers.get("content-type") == "application/json"
+    assert res.headers.get("content-type", "").startswith(JSON)
 
 
 def get_map_tile(session: Session, url: str, viewpoint_id: str) -> None:
@@ -48,8 +52,41 @@ def get_map_tile(session: Session, url: str, viewpoint_id: str) -> None:
 
     return: None
     """
-    res = session.get(f"{url}/{viewpoint_id}/map/tiles/WebMercatorQuad/0/0/0.PNG")
-    res.raise_for_status()
+    res = fetch_headers(session, f"{url}/{viewpoint_id}/map/tiles/WebMercatorQuad/0/0/0.PNG")
+    assert res.status_code == 200, failure_message(res, include_body=False)
+
+    assert res.headers.get("content-type", "").startswith(PNG)
+
+
+def get_map_tiles(session: Session, url: str, viewpoint_id: str, tileset_id: str, max_tiles: int = 16) -> None:
+    """
+    Test Case: Successfully get a batch of map tiles across the zoom levels of a tileset
 
-    assert res.status_code == 200
-    assert res.headers.get("content-type") == "image/png"
+    :param session: Requests session to use to send the request.
+    :param url: URL to send the request to.
+    :param viewpoint_id: Unique viewpoint id to get from the table.
+    :param tileset_id: ID of the tileset to get tiles from
+    :param max_tiles: Maximum number of tiles to request
+
+    return: None
+    """
+    res = session.get(f"{url}/{viewpoint_id}/map/tiles/{tileset_id}")
+    assert res.status_code == 200, failure_message(res)
+
+    tile_urls = list(
+        islice(
+            (
+                f"{url}/{viewpoint_id}/map/tiles/{tileset_id}/{limits['tileMatrix']}/{row}/{col}.PNG"
+                for limits in res.json()["tileMatrixSetLimits"]
+                for row in range(limits["minTileRow"], limits["maxTileRow"] + 1)
+                for col in range(limits["minTileCol"], limits["maxTileCol"] + 1)
+            ),
+            max_tiles,
+        )
+    )
+    assert len(tile_urls) > 0
+
+    with ThreadPoolExecutor(max_workers=len(tile_urls)) as executor:
+        for tile_res in executor.map(partial(fetch_headers, session), tile_urls):
+            assert tile_res.status_code == 200, failure_message(tile_res, include_body=False)
+            assert tile_res.headers.get("content-type", "").startswith(PNG)
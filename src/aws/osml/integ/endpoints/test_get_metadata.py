@@ -2,6 +2,10 @@
 
 from requests import Session
 
+from .session import failure_message
+
+_DELETED_METADATA = b"Cannot view ViewpointApiNames.METADATA for this image since this has already been deleted."
+
 
 def get_metadata(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -14,11 +18,10 @@ def get_metadata(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/metadata")
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 200
     assert "metadata" in response_data
 
 
@@ -32,12 +35,7 @@ def get_metadata_invalid(session: Session, url: str, viewpoint_id: str) -> None:
 
     return: None
     """
-    res = session("GET", f"{url}/{viewpoint_id}/image/metadata")
-
-    response_data = res.json()
+    res = session.get(f"{url}/{viewpoint_id}/image/metadata")
+    assert res.status_code == 404, failure_message(res)
 
-    assert res.status_code == 404
-    assert (
-        "Cannot view ViewpointApiNames.METADATA for this image since this has already been deleted."
-        in response_data["detail"]
-    )
+    assert _DELETED_METADATA in res.content
@@ -2,6 +2,8 @@
 
 from requests import Session
 
+from .session import DELETED_PREVIEW, JPEG, failure_message, fetch_headers
+
 
 def get_preview(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -13,11 +15,10 @@ def get_preview(session: Session, url: str, viewpoint_id: str) -> None:
 
     return: None
     """
-    res = session.get(f"{url}/{viewpoint_id}/image/preview.JPEG")
-    res.raise_for_status()
+    res = fetch_headers(session, f"{url}/{viewpoint_id}/image/preview.JPEG")
+    assert res.status_code == 200, failure_message(res, include_body=False)
 
-    assert res.status_code == 200
-    assert res.headers.get("content-type") == "image/jpeg"
+    assert res.headers.get("content-type", "").startswith(JPEG)
 
 
 def get_preview_invalid(session: Session, url: str, viewpoint_id: str) -> None:
@@ -31,11 +32,6 @@ def get_preview_invalid(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/preview.JPEG")
+    assert res.status_code == 404, failure_message(res)
 
-    response_data = res.json()
-
-    assert res.status_code == 404
-    assert (
-        "Cannot view ViewpointApiNames.PREVIEW for this image since this has already been deleted."
-        in response_data["detail"]
-    )
+    assert DELETED_PREVIEW in res.content
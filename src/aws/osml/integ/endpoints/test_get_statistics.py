@@ -2,6 +2,10 @@
 
 from requests import Session
 
+from .session import failure_message
+
+_DELETED_STATISTICS = b"Cannot view ViewpointApiNames.STATISTICS for this image since this has already been deleted."
+
 
 def get_statistics(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -14,12 +18,10 @@ def get_statistics(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/statistics")
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 200
-
     assert response_data["image_statistics"]["geoTransform"] is not None
     assert response_data["image_statistics"]["cornerCoordinates"] is not None
     assert response_data["image_statistics"]["bands"] is not None
@@ -36,11 +38,6 @@ def get_statistics_invalid(session: Session, url: str, viewpoint_id: str) -> Non
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/statistics")
+    assert res.status_code == 404, failure_message(res)
 
-    response_data = res.json()
-
-    assert res.status_code == 404
-    assert (
-        "Cannot view ViewpointApiNames.STATISTICS for this image since this has already been deleted."
-        in response_data["detail"]
-    )
+    assert _DELETED_STATISTICS in res.content
@@ -2,6 +2,10 @@
 
 from requests import Session
 
+from .session import PNG, failure_message
+
+_FAILED_TILE = b"Failed to fetch tile for image."
+
 
 def get_tile(session: Session, url: str, viewpoint_id: str) -> None:
     """
@@ -14,10 +18,9 @@ def get_tile(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/tiles/10/10/10.PNG")
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
-    assert res.status_code == 200
-    assert res.headers.get("content-type") == "image/png"
+    assert res.headers.get("content-type", "").startswith(PNG)
 
 
 def get_tile_invalid(session: Session, url: str, viewpoint_id: str) -> None:
@@ -31,8 +34,6 @@ def get_tile_invalid(session: Session, url: str, viewpoint_id: str) -> None:
     return: None
     """
     res = session.get(f"{url}/{viewpoint_id}/image/tiles/10/10/10.PNG")
+    assert res.status_code == 500, failure_message(res)
 
-    response_data = res.json()
-
-    assert res.status_code == 500
-    assert "Failed to fetch tile for image." in response_data["detail"]
+    assert _FAILED_TILE in res.content
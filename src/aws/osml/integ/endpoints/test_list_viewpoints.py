@@ -2,6 +2,8 @@
 
 from requests import Session
 
+from .session import failure_message
+
 
 def list_viewpoints(session: Session, url: str) -> None:
     """
@@ -13,9 +15,8 @@ def list_viewpoints(session: Session, url: str) -> None:
     return: None
     """
     res = session.get(url)
-    res.raise_for_status()
+    assert res.status_code == 200, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 200
     assert len(response_data["items"]) > 0
@@ -4,6 +4,10 @@ from typing import Any, Dict
 
 from requests import Session
 
+from .session import failure_message
+
+_DELETED_UPDATE = b"Cannot view ViewpointApiNames.UPDATE for this image since this has already been deleted."
+
 
 def update_viewpoint(session: Session, url: str, viewpoint_id: str, test_body_data: Dict[str, Any]) -> None:
     """
@@ -16,15 +20,12 @@ def update_viewpoint(session: Session, url: str, viewpoint_id: str, test_body_da
 
     return: None
     """
-    update_viewpoint_id = test_body_data
-    update_viewpoint_id["viewpoint_id"] = viewpoint_id
-
-    res = session.put(f"{url}", json=test_body_data)
-    res.raise_for_status()
+    body = {**test_body_data, "viewpoint_id": viewpoint_id}
+    res = session.put(url, json=body)
+    assert res.status_code == 201, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 201
     assert response_data["viewpoint_name"] == test_body_data["viewpoint_name"]
 
 
@@ -39,17 +40,11 @@ def update_viewpoint_invalid_deleted(session: Session, url: str, viewpoint_id: s
 
     return: None
     """
-    update_viewpoint_id = test_body_data
-    update_viewpoint_id["viewpoint_id"] = viewpoint_id
+    body = {**test_body_data, "viewpoint_id": viewpoint_id}
+    res = session.put(url, json=body)
+    assert res.status_code == 404, failure_message(res)
 
-    res = session.put(f"{url}", json=test_body_data)
-
-    response_data = res.json()
-
-    assert res.status_code == 404
-    assert (
-        "Cannot view ViewpointApiNames.UPDATE for this image since this has already been deleted." in response_data["detail"]
-    )
+    assert _DELETED_UPDATE in res.content
 
 
 def update_viewpoint_invalid_missing_field(
@@ -65,12 +60,10 @@ def update_viewpoint_invalid_missing_field(
 
     return: None
     """
-    update_viewpoint_id = test_body_data
-    update_viewpoint_id["viewpoint_id"] = viewpoint_id
-
-    res = session.put(f"{url}", json=test_body_data)
+    body = {**test_body_data, "viewpoint_id": viewpoint_id}
+    res = session.put(url, json=body)
+    assert res.status_code == 422, failure_message(res)
 
     response_data = res.json()
 
-    assert res.status_code == 422
     assert response_data["detail"][0]["msg"] == "Field required"
@@ -2,6 +2,34 @@
 
 from typing import Any, Dict
 
+_VIEWPOINT_NAME = "integ-test-viewpoint"
+
+# Request body templates; the config copies these so no test can mutate another test's body
+_VIEWPOINT_TMPL: Dict[str, Any] = {
+    "viewpoint_name": _VIEWPOINT_NAME,
+    "tile_size": 512,
+    "range_adjustment": "NONE",
+}
+
+_INVALID_VIEWPOINT_TMPL: Dict[str, Any] = {
+    "bucket_name": None,
+    "viewpoint_name": _VIEWPOINT_NAME,
+    "tile_size": 512,
+    "range_adjustment": "NONE",
+}
+
+_VALID_UPDATE_TMPL: Dict[str, Any] = {
+    "viewpoint_id": "",
+    "viewpoint_name": "new-integ-test-viewpoint-name",
+    "tile_size": 512,
+    "range_adjustment": "NONE",
+}
+
+_INVALID_UPDATE_TMPL: Dict[str, Any] = {
+    "tile_size": 512,
+    "range_adjustment": "NONE",
+}
+
 
 class TileServerIntegTestConfig:
     def __init__(self, endpoint: str, s3_bucket: str, s3_key: str):
@@ -13,35 +41,19 @@ class TileServerIntegTestConfig:
         self.test_object_key = s3_key
 
         # Viewpoint name
-        self.test_viewpoint_name: str = "integ-test-viewpoint"
+        self.test_viewpoint_name: str = _VIEWPOINT_NAME
 
         # Test Data
         self.test_invalid_viewpoint_id: str = "invalid-viewpoint-id"
 
         self.test_viewpoint: Dict[str, Any] = {
+            **_VIEWPOINT_TMPL,
             "bucket_name": self.test_bucket,
             "object_key": self.test_object_key,
-            "viewpoint_name": self.test_viewpoint_name,
-            "tile_size": 512,
-            "range_adjustment": "NONE",
         }
 
-        self.invalid_viewpoint: Dict[str, Any] = {
-            "bucket_name": None,
-            "object_key": self.test_object_key,
-            "viewpoint_name": self.test_viewpoint_name,
-            "tile_size": 512,
-            "range_adjustment": "NONE",
-        }
+        self.invalid_viewpoint: Dict[str, Any] = {**_INVALID_VIEWPOINT_TMPL, "object_key": self.test_object_key}
 
-        self.valid_update_test_body: Dict[str, Any] = {
-            "viewpoint_id": "",
-            "viewpoint_name": "new-integ-test-viewpoint-name",
-            "tile_size": 512,
-            "range_adjustment": "NONE",
-        }
+        self.valid_update_test_body: Dict[str, Any] = {**_VALID_UPDATE_TMPL}
 
-        self.invalid_update_test_body: Dict[str, Any] = {
-            "tile_size": 512,
-            "range_adjustment": "NONE",
-        }
+        self.invalid_update_test_body: Dict[str, Any] = {**_INVALID_UPDATE_TMPL}
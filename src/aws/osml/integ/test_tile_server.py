@@ -1,13 +1,13 @@
 #  Copyright 2024 Amazon.com, Inc. or its affiliates.
 
 import logging
-import traceback
-from collections import Counter
-from enum import Enum, auto
-from time import sleep
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Tuple
 
-from requests import Session
+from requests import Session, exceptions
 
 from .endpoints import (
     create_viewpoint,
@@ -16,279 +16,197 @@ from .endpoints import (
     delete_viewpoint_invalid,
     describe_viewpoint,
     get_bounds,
+    get_bounds_invalid,
     get_crop,
+    get_crop_invalid,
     get_info,
+    get_info_invalid,
     get_map_tile,
+    get_map_tiles,
     get_map_tileset_metadata,
     get_map_tilesets,
     get_metadata,
+    get_metadata_invalid,
     get_preview,
+    get_preview_invalid,
     get_statistics,
+    get_statistics_invalid,
     get_tile,
     list_viewpoints,
+    shared_session,
     update_viewpoint,
+    update_viewpoint_invalid_deleted,
 )
 from .test_config import TileServerIntegTestConfig
 
 
-class AutoStringEnum(Enum):
+class TestResult:
     """
-    A class used to represent an Enum where the value of the Enum member is the same as the name of the Enum member.
-    """
-
-    @staticmethod
-    def _generate_next_value_(name, start, count, last_values) -> str:
-        """
-        Function to iterate through the Enum members.
-
-        :param: name: Name of the Enum member.
-        :param: start: Initial integer to start with.
-        :param: count: Number of existing members.
-        :param: last_values: List of values for existing members.
-
-        :return: The next value of the enumeration which is the same as the name.
-        """
-        return name
-
-
-class TestResult(str, AutoStringEnum):
-    """
-    Provides enumeration of test result.
+    Provides the test result values.
 
     :cvar PASSED: Test passed.
     :cvar FAILED: Test failed.
     """
 
-    PASSED = auto()
-    FAILED = auto()
+    PASSED = "PASSED"
+    FAILED = "FAILED"
+
+
+# (name, test, extra args) run against the viewpoint by TestTileServer
+_TestEntry = Tuple[str, Callable[..., Any], Tuple[Any, ...]]
+
+# Checks that only read from the ready viewpoint
+_READ_TESTS: Tuple[_TestEntry, ...] = (
+    ("Get Metadata", get_metadata, ()),
+    ("Get Bounds", get_bounds, ()),
+    ("Get Info", get_info, ()),
+    ("Get Statistics", get_statistics, ()),
+    ("Get Preview", get_preview, ()),
+    ("Get Tile", get_tile, ()),
+    ("Get Crop", get_crop, ()),
+    ("Get Map Tilesets", get_map_tilesets, ()),
+    ("Get Map Tileset Metadata", get_map_tileset_metadata, ("WebMercatorQuad",)),
+    ("Get Map Tile", get_map_tile, ()),
+    ("Get Map Tiles", get_map_tiles, ("WebMercatorQuad",)),
+)
+
+# Checks that expect the viewpoint to be deleted
+_DELETED_TESTS: Tuple[_TestEntry, ...] = (
+    ("Get Bounds - Invalid", get_bounds_invalid, ()),
+    ("Get Crop - Invalid", get_crop_invalid, ()),
+    ("Get Info - Invalid", get_info_invalid, ()),
+    ("Get Metadata - Invalid", get_metadata_invalid, ()),
+    ("Get Preview - Invalid", get_preview_invalid, ()),
+    ("Get Statistics - Invalid", get_statistics_invalid, ()),
+)
 
 
 class TestTileServer:
     def __init__(self, test_config: TileServerIntegTestConfig):
         self.config: TileServerIntegTestConfig = test_config
-        self.session: Session = Session()
+        self.session: Session = shared_session()
         self.viewpoint_id = None
-        self.test_results = {}
+        self.viewpoint_url = None
+        self.test_results: Dict[str, str] = {}
+        self._results_lock = Lock()
+        self._pass_count = 0
+        self._fail_count = 0
         self.viewpoints_url = f"{self.config.endpoint}/viewpoints"
 
     def run_integ_test(self) -> None:
         logging.info("Running Tile Server integration test")
-        self.test_create_viewpoint()
-        self.test_describe_viewpoint()
+        self._run_test("Create Viewpoint - Invalid", create_viewpoint_invalid, self.config.invalid_viewpoint)
+        self.viewpoint_id = self._run_test("Create Viewpoint", create_viewpoint, self.config.test_viewpoint)
+        if self.viewpoint_id is None:
+            # Every remaining test needs the viewpoint, so report the failed create instead of running them
+            self._report_results()
+            return
+        self.viewpoint_url = f"{self.viewpoints_url}/{self.viewpoint_id}"
+        self._run_test("Describe Viewpoint", describe_viewpoint, self.viewpoint_id)
         self.wait_for_viewpoint_ready()
-        self.test_list_viewpoints()
-        self.test_update_viewpoint()
-        self.test_get_metadata()
-        self.test_get_bounds()
-        self.test_get_info()
-        self.test_get_statistics()
-        self.test_get_preview()
-        self.test_get_tile()
-        self.test_get_crop()
-        self.test_get_map_tilesets()
-        self.test_get_map_tileset_metadata()
-        self.test_get_map_tile()
-        self.test_delete_viewpoint()
-        test_summary = self._pretty_print_test_results(self.test_results)
-        if TestResult.FAILED in self.test_results.values():
+        self._run_test("List Viewpoints", list_viewpoints)
+        self._run_test("Update Viewpoint", update_viewpoint, self.viewpoint_id, self.config.valid_update_test_body)
+        self._run_concurrently(_READ_TESTS)
+        self._run_test("Delete Viewpoint", delete_viewpoint, self.viewpoint_id)
+        self._run_test("Delete Viewpoint - Invalid", delete_viewpoint_invalid, self.viewpoint_id)
+        self._run_concurrently(
+            _DELETED_TESTS
+            + (("Update Viewpoint - Invalid", update_viewpoint_invalid_deleted, (self.config.valid_update_test_body,)),)
+        )
+        self._report_results()
+
+    def _report_results(self) -> None:
+        test_summary = self._pretty_print_test_results(self.test_results, self._pass_count, self._fail_count)
+        if self._fail_count:
             raise Exception(test_summary)
         logging.info(test_summary)
 
-    def wait_for_viewpoint_ready(self) -> None:
-        polling_interval_sec = 2
-        timeout_sec = 300
-        elapsed_wait_time = 0
-        logging.info("Waiting for viewpoint status to be READY")
-        status = "REQUESTED"
-        while status == "REQUESTED":
-            if elapsed_wait_time > timeout_sec:
-                raise Exception(f"Test timed out waiting for viewpoint to be READY after {elapsed_wait_time} seconds.")
-            res = self.session.get(f"{self.viewpoints_url}/{self.viewpoint_id}")
-            res.raise_for_status()
-            status = res.json().get("viewpoint_status")
-            logging.info("...")
-            sleep(polling_interval_sec)
-            elapsed_wait_time += polling_interval_sec
-        if status != "READY":
-            raise Exception(f"Viewpoint status is {status}. Expected READY")
-
-    def test_create_viewpoint(self) -> None:
-        try:
-            logging.info("Testing create invalid viewpoint")
-            create_viewpoint_invalid(self.session, self.viewpoints_url, self.config.invalid_viewpoint)
-            self.test_results["Create Viewpoint - Invalid"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Create Viewpoint - Invalid"] = TestResult.FAILED
-        try:
-            logging.info("Testing create viewpoint")
-            self.viewpoint_id = create_viewpoint(self.session, self.viewpoints_url, self.config.test_viewpoint)
-            self.test_results["Create Viewpoint"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Create Viewpoint"] = TestResult.FAILED
-
-    def test_describe_viewpoint(self) -> None:
-        try:
-            logging.info("Testing describe viewpoint")
-            describe_viewpoint(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Describe Viewpoint"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Describe Viewpoint"] = TestResult.FAILED
-
-    def test_list_viewpoints(self) -> None:
-        try:
-            logging.info("Testing list viewpoints")
-            list_viewpoints(self.session, self.viewpoints_url)
-            self.test_results["List Viewpoints"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["List Viewpoints"] = TestResult.FAILED
-
-    def test_update_viewpoint(self) -> None:
-        try:
-            logging.info("Testing update viewpoint")
-            update_viewpoint(self.session, self.viewpoints_url, self.viewpoint_id, self.config.valid_update_test_body)
-            self.test_results["Update Viewpoint"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Update Viewpoint"] = TestResult.FAILED
-
-    def test_get_metadata(self) -> None:
-        try:
-            logging.info("Testing get metadata")
-            get_metadata(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Metadata"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Metadata"] = TestResult.FAILED
-
-    def test_get_bounds(self) -> None:
-        try:
-            logging.info("Testing get bounds")
-            get_bounds(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Bounds"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Bounds"] = TestResult.FAILED
+    def _run_test(self, test_name: str, test: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run one endpoint test against the viewpoints URL and record whether it passed.
 
-    def test_get_info(self) -> None:
-        try:
-            logging.info("Testing get info")
-            get_info(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Info"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Info"] = TestResult.FAILED
+        :param test_name: Name of the test shown in the summary.
+        :param test: Endpoint test taking the session and viewpoints URL followed by args.
+        :param args: Remaining arguments for the test.
 
-    def test_get_statistics(self) -> None:
-        try:
-            logging.info("Testing get statistics")
-            get_statistics(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Statistics"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Statistics"] = TestResult.FAILED
-
-    def test_get_preview(self) -> None:
+        :return: The value returned by the test, or None if it failed
+        """
+        logging.info("Testing %s", test_name)
         try:
-            logging.info("Testing get preview")
-            get_preview(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Preview"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Preview"] = TestResult.FAILED
+            result = test(self.session, self.viewpoints_url, *args)
+        except Exception:
+            logging.exception("%s failed", test_name)
+            self._record_result(test_name, TestResult.FAILED)
+            return None
+        self._record_result(test_name, TestResult.PASSED)
+        return result
 
-    def test_get_tile(self) -> None:
-        try:
-            logging.info("Testing get tile")
-            get_tile(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Tile"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Tile"] = TestResult.FAILED
+    def _run_concurrently(self, tests: Tuple[_TestEntry, ...]) -> None:
+        """
+        Run tests against the current viewpoint in parallel so their network round trips overlap.
 
-    def test_get_crop(self) -> None:
-        try:
-            logging.info("Testing get crop")
-            get_crop(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Crop"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Crop"] = TestResult.FAILED
+        :param tests: (name, test, extra args) entries that do not depend on each other's side effects.
 
-    def test_get_map_tilesets(self) -> None:
-        try:
-            logging.info("Testing get map tilesets")
-            get_map_tilesets(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Map Tilesets"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Map Tilesets"] = TestResult.FAILED
+        :return: None
+        """
+        run_test = self._run_test
+        viewpoint_id = self.viewpoint_id
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(run_test, name, test, viewpoint_id, *args) for name, test, args in tests]
+            for future in futures:
+                future.result()
+
+    def _record_result(self, test_name: str, result: str) -> None:
+        """
+        Record the outcome of a test; guarded by a lock because concurrently run tests report from worker threads.
 
-    def test_get_map_tileset_metadata(self) -> None:
-        try:
-            logging.info("Testing get map tileset metadata")
-            get_map_tileset_metadata(self.session, self.viewpoints_url, self.viewpoint_id, "WebMercatorQuad")
-            self.test_results["Get Map Tileset Metadata"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Map Tileset Metadata"] = TestResult.FAILED
+        :param test_name: Name of the test shown in the summary.
+        :param result: Outcome of the test.
 
-    def test_get_map_tile(self) -> None:
-        try:
-            logging.info("Testing get map tile")
-            get_map_tile(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Get Map Tile"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Get Map Tile"] = TestResult.FAILED
+        :return: None
+        """
+        with self._results_lock:
+            self.test_results[test_name] = result
+            self._pass_count += result == TestResult.PASSED
+            self._fail_count += result == TestResult.FAILED
 
-    def test_delete_viewpoint(self) -> None:
-        try:
-            logging.info("Testing delete viewpoint")
-            delete_viewpoint(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Delete Viewpoint"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Delete Viewpoint"] = TestResult.FAILED
-        try:
-            logging.info("Testing delete viewpoint invalid")  # viewpoint already deleted
-            delete_viewpoint_invalid(self.session, self.viewpoints_url, self.viewpoint_id)
-            self.test_results["Delete Viewpoint - Invalid"] = TestResult.PASSED
-        except Exception as err:
-            logging.info(f"\tFailed. {err}")
-            logging.error(traceback.print_exception(err))
-            self.test_results["Delete Viewpoint - Invalid"] = TestResult.FAILED
+    def wait_for_viewpoint_ready(self) -> None:
+        polling_interval_sec = 0.25
+        max_polling_interval_sec = 5.0
+        timeout_sec = 300
+        start_time = monotonic()
+        logging.info("Waiting for viewpoint status to be READY")
+        status = "REQUESTED"
+        while True:
+            elapsed_wait_time = monotonic() - start_time
+            if elapsed_wait_time > timeout_sec:
+                raise Exception(f"Test timed out waiting for viewpoint to be READY after {elapsed_wait_time:.1f} seconds.")
+            try:
+                res = self.session.get(self.viewpoint_url)
+            except (exceptions.ConnectionError, exceptions.RetryError):
+                # The session has already retried the connection or 502/503/504, so try again on the next poll
+                logging.warning("Viewpoint status check failed, retrying", exc_info=True)
+            else:
+                res.raise_for_status()
+                status = res.json().get("viewpoint_status")
+                if status != "REQUESTED":
+                    break
+            logging.info("...")
+            sleep(polling_interval_sec)
+            # Jitter keeps concurrent runs from polling the server in lockstep
+            polling_interval_sec = min(polling_interval_sec * 1.7 + uniform(0, 0.1), max_polling_interval_sec)
+        if status != "READY":
+            raise Exception(f"Viewpoint status is {status}. Expected READY")
 
     @staticmethod
-    def _pretty_print_test_results(test_results: Dict[str, TestResult]) -> str:
-        max_key_length = max([len(k) for k in test_results.keys()])
-        sorted_results = dict(sorted(test_results.items(), key=lambda x: x[0].lower()))
-        test_counter = Counter(test_results.values())
-        results_str = "\nTest Summary\n-------------------------------------\n"
-        for k, v in sorted_results.items():
-            results_str += f"{k.ljust(max_key_length + 5)}{v.value}\n"
-        n_tests = len(test_results)
-        passed = test_counter[TestResult.PASSED]
-        failed = test_counter[TestResult.FAILED]
+    def _pretty_print_test_results(test_results: Dict[str, str], passed: int, failed: int) -> str:
+        sorted_results = sorted(test_results.items(), key=lambda x: x[0].lower())
+        max_key_length = max(len(k) for k, _ in sorted_results)
+        rows = "".join([f"{k.ljust(max_key_length + 5)}{v}\n" for k, v in sorted_results])
+        n_tests = len(sorted_results)
         success = passed / n_tests * 100
-        results_str += f"    Tests: {n_tests}, Passed: {passed}, Failed: {failed}, Success: {success:.2f}%"
-        return results_str
+        return (
+            "\nTest Summary\n-------------------------------------\n"
+            f"{rows}"
+            f"    Tests: {n_tests}, Passed: {passed}, Failed: {failed}, Success: {success:.2f}%"
+        )
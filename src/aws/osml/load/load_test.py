@@ -1,19 +1,29 @@
 #  Copyright 2024 Amazon.com, Inc. or its affiliates.
 
 import logging
+import os
 import subprocess
+from typing import Dict
 
 
-def run_load_test(locust_run_time: str = "") -> None:
+def run_load_test(locust_env: Dict[str, str], locust_run_time: str = "") -> None:
     log_run_config = f"for {locust_run_time}" if locust_run_time else "UI on http://localhost:8089"
-    logging.info(f"Running Tile Server locust load test {log_run_config}")
+    logging.info("Running Tile Server locust load test %s", log_run_config)
 
-    child_process = subprocess.Popen("locust", stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    with child_process.stdout:
-        for line in iter(child_process.stdout.readline, b"\n"):
-            logging.info(line)
+    with subprocess.Popen(
+        ["locust"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        env={**os.environ, **locust_env},
+    ) as child_process:
+        for line in child_process.stdout:
+            logging.info(line.rstrip())
     locust_exit_code = child_process.returncode
     if locust_exit_code:
         raise RuntimeError(f"Exit code: {locust_exit_code}.")
     else:
-        logging.info(f"Load test succeeded with exit code: {locust_exit_code}.")
+        logging.info("Load test succeeded with exit code: %s.", locust_exit_code)
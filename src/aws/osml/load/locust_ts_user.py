@@ -4,10 +4,11 @@ import json
 import logging
 import os
 import random
-import time
+from functools import lru_cache
+from itertools import count
 from math import ceil, log
-from secrets import token_hex
-from typing import List, Optional
+from time import monotonic
+from typing import Iterator, List, Optional, Tuple
 
 import gevent
 from hilbertcurve.hilbertcurve import HilbertCurve
@@ -18,6 +19,43 @@ VIEWPOINT_STATUS = "viewpoint_status"
 VIEWPOINT_ID = "viewpoint_id"
 
 
+@lru_cache(maxsize=None)
+def _viewpoint_names(pid: int) -> Tuple[str, Iterator[int]]:
+    """
+    Gets the viewpoint name prefix and counter of a process. They are keyed by pid rather than built at import because
+    ``locust --processes`` imports this file before forking, and each worker needs its own prefix and counter.
+
+    :param pid: id of the process creating viewpoints
+    :return: name prefix unique to the process, with a random token in case pids repeat across hosts, and its counter
+    """
+    return f"LocustUser-Viewpoint-{pid:x}-{random.getrandbits(32):08x}-", count()
+
+
+def _next_viewpoint_name() -> str:
+    prefix, counter = _viewpoint_names(os.getpid())
+    return f"{prefix}{next(counter):x}"
+
+
+@lru_cache(maxsize=None)
+def _hilbert_tiles(num_tiles: int) -> Tuple[Tuple[int, int, int], ...]:
+    """
+    Computes the tiles requested by :meth:`TileServerUser.request_tiles`. Tiles at each zoom level follow a Hilbert
+    curve so neighboring requests cover neighboring areas of the image. The result only depends on the tile count, so
+    it is computed once and shared by every user.
+
+    :param num_tiles: number of tiles to request at the most detailed zoom level
+    :return: (x, y, zoom) coordinates of the tiles, ordered from the least to the most detailed zoom level
+    """
+    tiles = []
+    for z in [3, 2, 1, 0]:
+        num_tiles_at_zoom = ceil(num_tiles / (4**z))
+        p = ceil(log(num_tiles_at_zoom) / (2 * log(2)))
+        n = 2
+        hilbert_curve = HilbertCurve(p, n)
+        tiles.extend((x, y, z) for x, y in hilbert_curve.points_from_distances(range(num_tiles_at_zoom)))
+    return tuple(tiles)
+
+
 @events.init_command_line_parser.add_listener
 def _(parser):
     parser.add_argument("--test_images_bucket", type=str, default=os.environ.get("LOCUST_TEST_IMAGES_BUCKET"))
@@ -27,14 +65,17 @@ def _(parser):
 @events.test_start.add_listener
 def _(environment, **kwargs):
     """
-    This method logs the test images bucket and object prefix from the given environment.
+    This method parses the test image keys once for every user and logs the test images bucket and object prefix
+    from the given environment.
 
     :param environment: The environment object containing parsed options.
     :param kwargs: Additional keyword arguments (unused).
     :return: None
     """
-    logging.info(f"Using bucket: {environment.parsed_options.test_images_bucket}")
-    logging.info(f"Using images: {environment.parsed_options.test_image_keys}")
+    if isinstance(environment.parsed_options.test_image_keys, str):
+        environment.parsed_options.test_image_keys = tuple(json.loads(environment.parsed_options.test_image_keys))
+    logging.info("Using bucket: %s", environment.parsed_options.test_images_bucket)
+    logging.info("Using images: %s", environment.parsed_options.test_image_keys)
 
 
 class TileServerUser(FastHttpUser):
@@ -73,11 +114,11 @@ class TileServerUser(FastHttpUser):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.test_images_bucket = self.environment.parsed_options.test_images_bucket
-        if isinstance(self.environment.parsed_options.test_image_keys, list):
-            self.test_image_keys = self.environment.parsed_options.test_image_keys
-        else:
+        if isinstance(self.environment.parsed_options.test_image_keys, str):
             self.test_image_keys = json.loads(self.environment.parsed_options.test_image_keys)
-        logging.info(f"TileServerUser Initialization Parameters: {self.test_images_bucket} {self.test_image_keys}")
+        else:
+            self.test_image_keys = self.environment.parsed_options.test_image_keys
+        logging.info("TileServerUser Initialization Parameters: %s %s", self.test_images_bucket, self.test_image_keys)
 
     def on_start(self) -> None:
         """
@@ -86,7 +127,7 @@ class TileServerUser(FastHttpUser):
         if not self.test_image_keys:
             raise ValueError("No test imagery specified by --locust_image_keys")
         else:
-            logging.info(f"Using {len(self.test_image_keys)} test images")
+            logging.info("Using %d test images", len(self.test_image_keys))
 
     @task(5)
     def view_new_map_behavior(self) -> None:
@@ -133,13 +174,19 @@ class TileServerUser(FastHttpUser):
         viewpoint_ids = self.list_ready_viewpoints()
 
         def get_viewpoint_details(viewpoint_id: str):
-            self.get_viewpoint_metadata(viewpoint_id)
-            self.get_viewpoint_info(viewpoint_id)
-            self.get_viewpoint_bounds(viewpoint_id)
-            self.get_viewpoint_preview(viewpoint_id)
-            self.get_viewpoint_statistics(viewpoint_id)
+            # The detail calls are independent, so they are issued together instead of one after another
+            gevent.joinall(
+                [
+                    gevent.spawn(self.get_viewpoint_metadata, viewpoint_id),
+                    gevent.spawn(self.get_viewpoint_info, viewpoint_id),
+                    gevent.spawn(self.get_viewpoint_bounds, viewpoint_id),
+                    gevent.spawn(self.get_viewpoint_preview, viewpoint_id),
+                    gevent.spawn(self.get_viewpoint_statistics, viewpoint_id),
+                ]
+            )
 
-        pool = gevent.pool.Pool()
+        # Caps how many viewpoints are described at once
+        pool = gevent.pool.Pool(size=32)
         for viewpoint_id in viewpoint_ids:
             pool.spawn(get_viewpoint_details, viewpoint_id)
         pool.join()
@@ -159,7 +206,7 @@ class TileServerUser(FastHttpUser):
             "/viewpoints",
             name="CreateViewpoint",
             json={
-                "viewpoint_name": "LocustUser-Viewpoint-" + token_hex(16),
+                "viewpoint_name": _next_viewpoint_name(),
                 "bucket_name": test_images_bucket,
                 "object_key": test_image_key,
                 "tile_size": tile_size,
@@ -180,22 +227,22 @@ class TileServerUser(FastHttpUser):
         :param viewpoint_id: ID of the viewpoint to wait for
         :return: final status of the viewpoint
         """
-        done = False
-        num_retries = 120
+        polling_interval_sec = 1.0
+        max_polling_interval_sec = 15.0
+        deadline = monotonic() + 30 * 60
         final_status = "NOT_FOUND"
-        while not done and num_retries > 0:
+        while True:
             with self.rest("GET", f"/viewpoints/{viewpoint_id}", name="DescribeViewpoint") as response:
                 if response.js is not None and VIEWPOINT_STATUS in response.js:
                     final_status = response.js[VIEWPOINT_STATUS]
-                    if response.js[VIEWPOINT_STATUS] in ["READY", "FAILED", "DELETED"]:
-                        done = True
-                    else:
-                        time.sleep(15)
-                        num_retries -= 1
-        if not done:
-            response.failure(f"Gave up waiting for {viewpoint_id} to become ready. Final Status was {final_status}")
-
-        return final_status
+                    if final_status in ["READY", "FAILED", "DELETED"]:
+                        return final_status
+                if monotonic() >= deadline:
+                    response.failure(f"Gave up waiting for {viewpoint_id} to become ready. Final Status was {final_status}")
+                    return final_status
+            # Responses without a status are polled again after the same backoff instead of immediately
+            gevent.sleep(polling_interval_sec)
+            polling_interval_sec = min(polling_interval_sec * 1.7, max_polling_interval_sec)
 
     def request_tiles(self, viewpoint_id: str, num_tiles: int = 100, batch_size: int = 5) -> None:
         """
@@ -203,41 +250,36 @@ class TileServerUser(FastHttpUser):
 
         :param viewpoint_id: ID of the viewpoint to request tiles for
         :param num_tiles: number of tiles to request
-        :param batch_size: number of tiles to request in parallel
+        :param batch_size: number of tiles to request in parallel; up to 4 batches are kept in flight
         :return: None
         """
         tile_format = "PNG"
         compression = "NONE"
+        url_prefix = f"/viewpoints/{viewpoint_id}/image/tiles"
+        url_suffix = f".{tile_format}?compression={compression}"
 
         def concurrent_tile_request(tile: (int, int, int)):
-            url = (
-                f"/viewpoints/{viewpoint_id}/image/tiles/"
-                f"{tile[2]}/{tile[0]}/{tile[1]}.{tile_format}?compression={compression}"
-            )
-            with self.client.get(url, name="GetTile") as response:
+            x, y, z = tile
+            url = f"{url_prefix}/{z}/{x}/{y}{url_suffix}"
+            with self.client.get(url, name="GetTile", catch_response=True) as response:
                 if not response.content:
                     response.failure("GetTile response contained no content")
 
-        for z in [3, 2, 1, 0]:
-            num_tiles_at_zoom = ceil(num_tiles / (4**z))
-            p = ceil(log(num_tiles_at_zoom) / (2 * log(2)))
-            n = 2
-            hilbert_curve = HilbertCurve(p, n)
-            for i in range(0, num_tiles_at_zoom, batch_size):
-                distances = list(range(i, min(i + batch_size, num_tiles_at_zoom)))
-                tiles = [(p[0], p[1], z) for p in hilbert_curve.points_from_distances(distances)]
-                pool = gevent.pool.Pool()
-                for tile in tiles:
-                    pool.spawn(concurrent_tile_request, tile)
-                pool.join()
+        # One pool caps the in-flight requests for the whole call instead of waiting on every batch to finish
+        pool = gevent.pool.Pool(size=batch_size * 4)
+        for tile in _hilbert_tiles(num_tiles):
+            pool.spawn(concurrent_tile_request, tile)
+        pool.join()
 
     def request_map_tiles(
-        self, viewpoint_id: str, tile_matrix_set_id: str = "WebMercatorQuad", num_tiles: int = 100
+        self, viewpoint_id: str, tile_matrix_set_id: str = "WebMercatorQuad", num_tiles: int = 100, batch_size: int = 5
     ) -> None:
         self.get_viewpoint_tilesets(viewpoint_id)
 
         tile_format = "PNG"
         compression = "NONE"
+        url_prefix = f"/viewpoints/{viewpoint_id}/map/tiles/{tile_matrix_set_id}"
+        url_suffix = f".{tile_format}?compression={compression}"
 
         parsed_tileset_limits = {}
         max_zoom_level = 0
@@ -253,15 +295,14 @@ class TileServerUser(FastHttpUser):
             )
 
         def concurrent_tile_request(tile: (int, int, int)):
-            url = (
-                f"/viewpoints/{viewpoint_id}/map/tiles/"
-                f"WebMercatorQuad/{tile[2]}/{tile[1]}/{tile[0]}.{tile_format}?compression={compression}"
-            )
-            with self.client.get(url, name="GetMapTile") as response:
+            tx, ty, zoom = tile
+            url = f"{url_prefix}/{zoom}/{ty}/{tx}{url_suffix}"
+            with self.client.get(url, name="GetMapTile", catch_response=True) as response:
                 if not response.content:
                     response.failure("GetMapTile response contained no content")
 
         num_tiles_fetched = 0
+        pool = gevent.pool.Pool(size=batch_size * 4)
         for zoom in range(0, max_zoom_level + 1):
             if zoom not in parsed_tileset_limits:
                 # Skipping this zoom level because the tile limits haven't been specified
@@ -269,14 +310,13 @@ class TileServerUser(FastHttpUser):
 
             min_ty, min_tx, max_ty, max_tx = parsed_tileset_limits[zoom]
 
-            pool = gevent.pool.Pool()
             for ty in range(min_ty, max_ty + 1):
                 for tx in range(min_tx, max_tx + 1):
                     if num_tiles_fetched >= num_tiles:
                         break
-                    pool.spawn(concurrent_tile_request((tx, ty, zoom)))
+                    pool.spawn(concurrent_tile_request, (tx, ty, zoom))
                     num_tiles_fetched += 1
-            pool.join()
+        pool.join()
 
     def cleanup_viewpoint(self, viewpoint_id: str) -> None:
         """
@@ -375,8 +415,11 @@ class TileServerUser(FastHttpUser):
         :param viewpoint_id: ID of the viewpoint to fetch preview for
         """
         tile_format = "PNG"
-        with self.client.get(f"/viewpoints/{viewpoint_id}/image/preview.{tile_format}", name="GetPreview") as response:
-            if response.status_code == 404 and "already been deleted" in response.js["detail"]:
+        with self.client.get(
+            f"/viewpoints/{viewpoint_id}/image/preview.{tile_format}", name="GetPreview", catch_response=True
+        ) as response:
+            # client.get responses have no .js, which only self.rest provides, so match the JSON error body as bytes
+            if response.status_code == 404 and b"already been deleted" in response.content:
                 # It is possible the viewpoint was deleted between the call to list and this call. A 404 response may
                 # be valid.
                 response.success()
@@ -3,139 +3,279 @@
 import json
 import logging
 import os
-import sys
+import time
 import traceback
 from argparse import ArgumentParser
-from datetime import datetime, timezone
-from distutils.util import strtobool
-from typing import Dict, Tuple
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Tuple
 
-import requests
-from gevent import monkey
-from integ import TestTileServer, TileServerIntegTestConfig
-from load import run_load_test
+import urllib3
 
-# locust workaround https://github.com/gevent/gevent/issues/1016
-monkey.patch_all()
+if TYPE_CHECKING:
+    from integ import TileServerIntegTestConfig
 
+# Keeps the connection to the local Lambda runtime API alive between the next/response/error calls; /next is a
+# long poll so it only bounds the connect, while the response and error posts also bound the read
+_LAMBDA_HTTP = urllib3.PoolManager(num_pools=1, maxsize=2, retries=False)
+_NEXT_TIMEOUT = urllib3.Timeout(connect=1, read=None)
+_POST_TIMEOUT = urllib3.Timeout(connect=1, read=5)
 
-def set_integ_test_config(runtime_params: Dict) -> TileServerIntegTestConfig:
-    endpoint = runtime_params.get("endpoint")
-    image_bucket = runtime_params.get("source_image_bucket", "")
-    image_key = runtime_params.get("source_image_key", "")
-    test_config = TileServerIntegTestConfig(endpoint=endpoint, s3_bucket=image_bucket, s3_key=image_key)
-    return test_config
+# Invocation URL prefix of the Lambda runtime API, resolved once when running inside Lambda
+_RUNTIME_API = os.getenv("AWS_LAMBDA_RUNTIME_API")
+_RUNTIME_BASE = f"http://{_RUNTIME_API}/2018-06-01/runtime/invocation" if _RUNTIME_API else None
 
 
-def set_load_test_env(args: Dict) -> None:
-    datetime_now_string = datetime.now(timezone.utc).isoformat(timespec="seconds").replace(":", "")
-    is_headless = args.get("locust_headless")
+@dataclass(frozen=True)
+class RuntimeArgs:
+    """
+    Arguments of a test run, parsed once from the command line and overridden per Lambda invocation.
+    """
+
+    endpoint: Optional[str] = None
+    test_type: Optional[str] = None
+    source_image_bucket: str = ""
+    source_image_key: str = ""
+    locust_headless: bool = False
+    locust_users: str = "1"
+    locust_run_time: str = "5m"
+    locust_spawn_rate: str = "1"
+    locust_image_keys: List[str] = field(default_factory=list)
+    v: bool = False
+    vv: bool = False
+
+    @classmethod
+    def from_mapping(cls, args: Mapping) -> "RuntimeArgs":
+        """
+        Build the arguments from a mapping such as the parsed command line, ignoring unknown and unset keys.
+
+        :param args: Argument names mapped to their values.
+
+        :return: RuntimeArgs with the defaults filled in for any argument that is missing or None
+        """
+        return cls(**_known_args(args))
+
+    def with_overrides(self, overrides: Mapping) -> "RuntimeArgs":
+        """
+        Copy the arguments with the known, non-None values of a Lambda invocation taking precedence.
+
+        :param overrides: Lambda invocation arguments.
+
+        :return: New RuntimeArgs; this instance is left unchanged
+        """
+        return replace(self, **_known_args(overrides))
+
+
+_RUNTIME_ARG_NAMES = frozenset(f.name for f in fields(RuntimeArgs))
+
+
+def _known_args(args: Mapping) -> Dict:
+    return {name: value for name, value in args.items() if name in _RUNTIME_ARG_NAMES and value is not None}
+
+
+def set_integ_test_config(runtime_args: RuntimeArgs) -> "TileServerIntegTestConfig":
+    from integ import TileServerIntegTestConfig
+
+    return TileServerIntegTestConfig(
+        endpoint=runtime_args.endpoint, s3_bucket=runtime_args.source_image_bucket, s3_key=runtime_args.source_image_key
+    )
+
+
+def load_test_env(args: RuntimeArgs) -> Dict[str, str]:
     # https://stackoverflow.com/questions/46397580/how-to-invoke-locust-tests-programmatically
-    os.environ["LOCUST_LOCUSTFILE"] = "src/aws/osml/load/locust_ts_user.py"
-    if is_headless:
-        os.environ["LOCUST_HEADLESS"] = str(is_headless)
-        os.environ["LOCUST_RUN_TIME"] = args.get("locust_run_time")
-        os.environ["LOCUST_USERS"] = args.get("locust_users")
-        os.environ["LOCUST_SPAWN_RATE"] = args.get("locust_spawn_rate")
+    # Only handed to the locust child process, so nothing leaks into later invocations of a warm Lambda container
+    locust_env: Dict[str, str] = {
+        "LOCUST_LOCUSTFILE": "src/aws/osml/load/locust_ts_user.py",
+        "LOCUST_HOST": args.endpoint or "",
+        # custom Locus params
+        "LOCUST_TEST_IMAGES_BUCKET": args.source_image_bucket,
+        "LOCUST_TEST_IMAGE_KEYS": json.dumps(args.locust_image_keys),
+    }
+    if args.locust_headless:
+        locust_env["LOCUST_HEADLESS"] = str(args.locust_headless)
+        locust_env["LOCUST_RUN_TIME"] = args.locust_run_time
+        locust_env["LOCUST_USERS"] = args.locust_users
+        locust_env["LOCUST_SPAWN_RATE"] = args.locust_spawn_rate
     else:
-        os.environ["LOCUST_CSV"] = datetime_now_string
-        os.environ["LOCUST_HTML"] = datetime_now_string
-    os.environ["LOCUST_HOST"] = args.get("endpoint", "")
-
-    # custom Locus params
-    os.environ["LOCUST_TEST_IMAGES_BUCKET"] = args.get("source_image_bucket", "")
-    os.environ["LOCUST_TEST_IMAGE_KEYS"] = json.dumps(args.get("locust_image_keys", []))
-    logging.info(f"Setup Locust Test Environment: {os.environ}")
-
-
-def lambda_get_next(lambda_runtime_api: str, function_name: str) -> Tuple[Dict, Dict]:
-    res = requests.get(f"http://{lambda_runtime_api}/2018-06-01/runtime/invocation/next")
-    logging.debug(f"Lambda job info (header): {res.headers}")
-    logging.debug(f"Lambda job parameters (json body): {res.json()}")
-    if function_name in res.headers.get("Lambda-Runtime-Invoked-Function-Arn", ""):
-        return res.headers, res.json()
-    else:
-        return {}, {}
+        # Same name as the colon-free UTC isoformat, e.g. 2024-01-31T120000+0000
+        report_name = time.strftime("%Y-%m-%dT%H%M%S+0000", time.gmtime())
+        locust_env["LOCUST_CSV"] = report_name
+        locust_env["LOCUST_HTML"] = report_name
+    logging.info("Setup Locust Test Environment: %s", locust_env)
+    return locust_env
+
+
+class InvalidInvocation(Exception):
+    """
+    A Lambda invocation this function cannot run; it is answered with an error instead of executing a test.
+
+    :param request_id: Request id of the rejected invocation.
+    :param error_type: errorType reported to the Lambda runtime API.
+    :param message: errorMessage reported to the Lambda runtime API.
+    """
+
+    def __init__(self, request_id: str, error_type: str, message: str):
+        super().__init__(message)
+        self.request_id = request_id
+        self.error_type = error_type
+
 
+def lambda_get_next(function_name: str) -> Tuple[str, Dict]:
+    """
+    Wait for the next Lambda invocation and parse its arguments.
 
-def lambda_send_success(lambda_runtime_api: str, request_id: str) -> None:
-    res = requests.post(f"http://{lambda_runtime_api}/2018-06-01/runtime/invocation/{request_id}/response", data="SUCCESS")
-    logging.debug(f"lambda_send_success headers: {res.headers}, response: {res.text}")
+    :param function_name: Name of this Lambda function, which the invoked function ARN must contain.
+
+    :raises RuntimeError: When the runtime API fails to return an invocation
+    :raises InvalidInvocation: When the invocation is for another function or its body is not a JSON object
+    :return: Request id and arguments of the invocation
+    """
+    # Left unbuffered so the event body is only held in memory while it is parsed, and never for other functions
+    res = _LAMBDA_HTTP.request("GET", f"{_RUNTIME_BASE}/next", timeout=_NEXT_TIMEOUT, preload_content=False)
+    logging.debug("Lambda job info (header): %s", res.headers)
+    try:
+        request_id = res.headers.get("Lambda-Runtime-Aws-Request-Id")
+        if res.status != 200 or not request_id:
+            # The Runtime API contract is to exit on a failed /next; Lambda then restarts the runtime
+            raise RuntimeError(f"Lambda runtime API /next failed with {res.status}: {res.read()[:200]!r}")
+        arn = res.headers.get("Lambda-Runtime-Invoked-Function-Arn", "")
+        if function_name not in arn:
+            # Not an invocation of this function, so its event body is discarded unparsed
+            res.drain_conn()
+            raise InvalidInvocation(
+                request_id, "InvalidFunction", f"Invocation of {arn} is not for function {function_name}."
+            )
+        try:
+            job_args = json.loads(res.read())
+        except ValueError as err:
+            raise InvalidInvocation(request_id, "InvalidRequest", f"Invocation body is not valid JSON: {err}") from err
+    finally:
+        res.release_conn()
+    logging.debug("Lambda job parameters (json body): %s", job_args)
+    if not isinstance(job_args, dict):
+        raise InvalidInvocation(
+            request_id, "InvalidRequest", f"Invocation body must be a JSON object, got {type(job_args).__name__}."
+        )
+    return request_id, job_args
+
+
+def lambda_send_success(request_id: str) -> None:
+    res = _LAMBDA_HTTP.request("POST", f"{_RUNTIME_BASE}/{request_id}/response", body=b"SUCCESS", timeout=_POST_TIMEOUT)
+    logging.debug("lambda_send_success headers: %s, response: %s", res.headers, res.data)
+
+
+def lambda_send_failure(request_id: str, error_info: Dict) -> None:
+    res = _LAMBDA_HTTP.request(
+        "POST",
+        f"{_RUNTIME_BASE}/{request_id}/error",
+        body=json.dumps(error_info).encode(),
+        headers={"Content-Type": "application/json"},
+        timeout=_POST_TIMEOUT,
+    )
+    logging.debug("lambda_send_failure headers: %s, response: %s", res.headers, res.data)
 
 
-def lambda_send_failure(lambda_runtime_api: str, request_id: str, error_info: Dict) -> None:
-    res = requests.post(f"http://{lambda_runtime_api}/2018-06-01/runtime/invocation/{request_id}/error", json=error_info)
-    logging.debug(f"lambda_send_failure headers: {res.headers}, response: {res.text}")
+def _report_failure(lambda_request_id: str, err: Exception) -> None:
+    error_info = {"errorMessage": str(err), "errorType": type(err).__name__, "stackTrace": [traceback.format_exc()]}
+    lambda_send_failure(lambda_request_id, error_info)
 
 
-def main(cmd_args: Dict) -> None:
-    exit_message: str | int = 0
+def _run_integ(runtime_args: RuntimeArgs) -> None:
+    from integ import TestTileServer
+
+    TestTileServer(test_config=set_integ_test_config(runtime_args)).run_integ_test()
+
+
+def _run_load(runtime_args: RuntimeArgs) -> None:
+    # Locust runs in a child process and monkey-patches itself there, so this process is never patched
+    from load import run_load_test
+
+    locust_env = load_test_env(runtime_args)
+    run_load_test(locust_env, locust_env.get("LOCUST_RUN_TIME", ""))
+
+
+# Test runners keyed by --test_type; Lambda payloads that only contain one of the names still match
+_TEST_RUNNERS: Dict[str, Callable[[RuntimeArgs], None]] = {"integ": _run_integ, "load": _run_load}
+
+
+def execute_test(runtime_args: RuntimeArgs, lambda_request_id: Optional[str] = None) -> None:
+    """
+    Run the test selected by the runtime arguments and report the outcome to Lambda when serving an invocation.
+
+    :param runtime_args: Command line arguments merged with the Lambda invocation arguments.
+    :param lambda_request_id: Request id of the Lambda invocation being served, if any.
+
+    :raises SystemExit: With the error message when a CLI run (no lambda_request_id) fails
+    """
+    logging.info("Executing test with runtime arguments: %s", runtime_args)
+
+    test_type = (runtime_args.test_type or "").strip().lower()
+    runner = _TEST_RUNNERS.get(test_type) or next(
+        (runner for name, runner in _TEST_RUNNERS.items() if name in test_type), None
+    )
+    if runner is None:
+        message = f"--test_type {runtime_args.test_type} not recognized. Valid options are [ 'integ' | 'load' ]."
+        if lambda_request_id:
+            error_info = {"errorMessage": message, "errorType": "ArgumentError", "stackTrace": []}
+            lambda_send_failure(lambda_request_id, error_info)
+            return
+        raise SystemExit(message)
+
+    try:
+        runner(runtime_args)
+    except Exception as err:
+        if not lambda_request_id:
+            # CLI runs exit with the message; only a waiting Lambda invocation gets the formatted traceback
+            raise SystemExit(f"{err}") from err
+        _report_failure(lambda_request_id, err)
+        return
+    if lambda_request_id:
+        lambda_send_success(lambda_request_id)
+
+
+def main(cmd_args: RuntimeArgs) -> None:
     # Set logging from cmd_args
-    if cmd_args.get("v"):
+    if cmd_args.v:
         logging.basicConfig(level=logging.INFO)
-    if cmd_args.get("vv"):
+    if cmd_args.vv:
         logging.basicConfig(level=logging.DEBUG)
 
-    # AWS Lambda setup, if applicable
-    this_lambda_name = os.getenv("AWS_LAMBDA_FUNCTION_NAME")
-    lambda_runtime_api = os.getenv("AWS_LAMBDA_RUNTIME_API")
-    lambda_args = {}
-    lambda_request_id = None
-    if lambda_runtime_api:
-        lambda_headers, lambda_args = lambda_get_next(lambda_runtime_api, this_lambda_name)
-        lambda_request_id = lambda_headers.get("Lambda-Runtime-Aws-Request-Id") if lambda_runtime_api else None
-        logging.info(f"lambda_runtime_api: {lambda_runtime_api}, RequestId: {lambda_request_id}")
-
-    runtime_args = cmd_args | lambda_args  # lambda args take precedent over cmd args
+    if not _RUNTIME_BASE:
+        execute_test(cmd_args)
+        return
 
-    logging.info(f"Executing test with runtime arguments: {runtime_args}")
-
-    # Run test
-    if "integ" in runtime_args.get("test_type", "").lower():
-        integ_test_config = set_integ_test_config(runtime_args)
-        server_to_test = TestTileServer(test_config=integ_test_config)
-        try:
-            server_to_test.run_integ_test()
-            if lambda_runtime_api and lambda_request_id:
-                lambda_send_success(lambda_runtime_api, lambda_request_id)
-        except Exception as err:
-            if lambda_runtime_api and lambda_request_id:
-                error_info = {
-                    "errorMessage": str(err),
-                    "errorType": type(err).__name__,
-                    "stackTrace": [traceback.format_exc()],
-                }
-                lambda_send_failure(lambda_runtime_api, lambda_request_id, error_info)
-            exit_message = f"{err}"
-    elif "load" in runtime_args.get("test_type", "").lower():
-        set_load_test_env(runtime_args)
+    # AWS Lambda: keep serving invocations from this warm container instead of exiting after the first one
+    this_lambda_name = os.getenv("AWS_LAMBDA_FUNCTION_NAME", "")
+    while True:
         try:
-            run_load_test(os.environ.get("LOCUST_RUN_TIME", ""))
-            if lambda_runtime_api and lambda_request_id:
-                lambda_send_success(lambda_runtime_api, lambda_request_id)
-        except Exception as err:
-            if lambda_runtime_api and lambda_request_id:
-                error_info = {
-                    "errorMessage": str(err),
-                    "errorType": type(err).__name__,
-                    "stackTrace": [traceback.format_exc()],
-                }
-                lambda_send_failure(lambda_runtime_api, lambda_request_id, error_info)
-            exit_message = f"{err}"
-    else:
-        message = f"--test_type {runtime_args.get('test_type')} not recognized. Valid options are [ 'integ' | 'load' ]."
-        if lambda_runtime_api and lambda_request_id:
-            error_info = {"errorMessage": message, "errorType": "ArgumentError", "stackTrace": []}
-            lambda_send_failure(lambda_runtime_api, lambda_request_id, error_info)
-        exit_message = message
-    sys.exit(exit_message)
+            lambda_request_id, lambda_args = lambda_get_next(this_lambda_name)
+        except InvalidInvocation as err:
+            logging.warning("Rejected Lambda invocation %s: %s", err.request_id, err)
+            lambda_send_failure(err.request_id, {"errorMessage": str(err), "errorType": err.error_type, "stackTrace": []})
+            continue
+        logging.info("lambda_runtime_api: %s, RequestId: %s", _RUNTIME_API, lambda_request_id)
+        execute_test(cmd_args.with_overrides(lambda_args), lambda_request_id)  # lambda args take precedent over cmd args
 
 
 def list_of_strings(arg) -> list:
     return arg.split(",")
 
 
-if __name__ == "__main__":
+_TRUE_STRINGS = frozenset({"y", "yes", "t", "true", "on", "1"})
+_FALSE_STRINGS = frozenset({"n", "no", "f", "false", "off", "0"})
+
+
+def string_to_bool(arg) -> bool:
+    value = str(arg).strip().lower()
+    if value in _TRUE_STRINGS:
+        return True
+    if value in _FALSE_STRINGS:
+        return False
+    raise ValueError(f"invalid truth value {arg!r}")
+
+
+@lru_cache(maxsize=None)
+def _build_parser() -> ArgumentParser:
     parser = ArgumentParser("test_tile_server")
     parser.add_argument("--endpoint", help="Endpoint of the Tile Server to test", type=str)
     parser.add_argument("--test_type", help="Type of test to run against Tile Server.", choices=["integ", "load"], type=str)
@@ -144,7 +284,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--locust_headless",
         help="Load Test: Disable the web interface, and start the test immediately.",
-        type=lambda x: bool(strtobool(str(x))),
+        type=string_to_bool,
         default=False,
     )
     parser.add_argument("--locust_users", help="Load Test: Peak number of concurrent Locust users.", type=str, default="1")
@@ -166,4 +306,8 @@ if __name__ == "__main__":
 
     parser.add_argument("-v", help="Increase output verbosity", action="store_true")
     parser.add_argument("-vv", help="Additional increase in output verbosity", action="store_true")
-    main(vars(parser.parse_args()))
+    return parser
+
+
+if __name__ == "__main__":
+    main(RuntimeArgs.from_mapping(vars(_build_parser().parse_args())))